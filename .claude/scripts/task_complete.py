@@ -3,57 +3,47 @@
 import sys
 import os
 import re
+import mmap
 import argparse
 
 
+# An incomplete task line plus its continuation: indented lines, possibly
+# separated by blank lines. Trailing blank lines are not part of the block.
+_RE_INCOMPLETE_BLOCK = re.compile(
+    rb"^- \[ \][^\n]*(?:(?:\n[^\S\n]*)*\n[^\S\n]+\S[^\n]*)*\n?",
+    re.MULTILINE,
+)
+
+
 def mark_first_task(filename, mark_type):
     try:
         if not os.path.exists(filename):
             print(f"No tasks found (file doesn't exist)", file=sys.stderr)
             sys.exit(1)
 
-        with open(filename, "r") as file:
-            lines = file.readlines()
-
-        modified = False
-        task_lines = []
-
-        for i, line in enumerate(lines):
-            if re.match(r"^- \[ \]", line):
-                if mark_type == "progress":
-                    lines[i] = re.sub(r"^- \[ \]", "- [>]", line)
-                elif mark_type == "blocked":
-                    lines[i] = re.sub(r"^- \[ \]", "- [!]", line)
-                else:
-                    lines[i] = re.sub(r"^- \[ \]", "- [x]", line)
-
-                task_lines.append(lines[i])
-                modified = True
-
-                j = i + 1
-                while j < len(lines):
-                    next_line = lines[j]
-                    if re.match(r"^[\s\t]+", next_line) and next_line.strip():
-                        task_lines.append(next_line)
-                    elif re.match(r"^- \[[x>\s]\]", next_line):
-                        break
-                    elif re.match(r"^#", next_line):
-                        break
-                    elif next_line.strip() == "":
-                        task_lines.append(next_line)
-                    else:
-                        break
-                    j += 1
-                break
-
-        if modified:
-            with open(filename, "w") as file:
-                file.writelines(lines)
-
-            while task_lines and task_lines[-1].strip() == "":
-                task_lines.pop()
-
-            print("".join(task_lines), end="")
+        if mark_type == "progress":
+            state = b">"
+        elif mark_type == "blocked":
+            state = b"!"
+        else:
+            state = b"x"
+
+        task = None
+
+        with open(filename, "rb+") as file:
+            # mmap refuses empty files, which have no tasks anyway
+            if os.fstat(file.fileno()).st_size:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_WRITE) as mm:
+                    match = _RE_INCOMPLETE_BLOCK.search(mm)
+                    if match:
+                        # Only the state character inside "- [ ]" changes,
+                        # so it is overwritten in place and nothing else moves
+                        start = match.start()
+                        mm[start + 3:start + 4] = state
+                        task = mm[start:match.end()]
+
+        if task is not None:
+            sys.stdout.buffer.write(task)
         else:
             print("No incomplete tasks found", file=sys.stderr)
             sys.exit(1)
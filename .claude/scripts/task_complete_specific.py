@@ -17,13 +17,23 @@ Usage:
 import sys
 import os
 import re
+import mmap
 import argparse
 import fcntl
 
 
+# An in-progress [>] or incomplete [ ] task line plus its continuation:
+# indented lines, possibly separated by blank lines. Trailing blank lines are
+# not part of the block. Group 1 is the task description.
+_RE_OPEN_BLOCK = re.compile(
+    rb"^- \[[> ]\] ([^\n]+)(?:(?:\n[^\S\n]*)*\n[^\S\n]+\S[^\n]*)*\n?",
+    re.MULTILINE,
+)
+
+
 def normalize(text):
     """Normalize whitespace for comparison."""
-    return " ".join(text.split()).strip()
+    return b" ".join(text.split())
 
 
 def mark_specific_task(filename, task_text, mark_type):
@@ -32,59 +42,35 @@ def mark_specific_task(filename, task_text, mark_type):
             print("No tasks found (file doesn't exist)", file=sys.stderr)
             sys.exit(1)
 
-        normalized_target = normalize(task_text)
+        # Compare raw bytes; fsencode gives back the argument as passed
+        normalized_target = normalize(os.fsencode(task_text))
+
+        if mark_type == "blocked":
+            state = b"!"
+        else:
+            state = b"x"
 
-        with open(filename, "r+") as file:
+        with open(filename, "rb+") as file:
             # Acquire exclusive lock
             fcntl.flock(file.fileno(), fcntl.LOCK_EX)
 
-            lines = file.readlines()
-            modified = False
-            task_lines = []
-
-            for i, line in enumerate(lines):
-                # Match tasks that are in-progress [>] or incomplete [ ]
-                match = re.match(r"^- \[[> ]\] (.+)", line)
-                if match:
-                    line_task_text = normalize(match.group(1))
-                    if line_task_text == normalized_target:
-                        # Found the task - mark it
-                        if mark_type == "blocked":
-                            lines[i] = re.sub(r"^- \[[> ]\]", "- [!]", line)
-                        else:
-                            lines[i] = re.sub(r"^- \[[> ]\]", "- [x]", line)
-
-                        task_lines.append(lines[i])
-
-                        # Collect continuation lines
-                        j = i + 1
-                        while j < len(lines):
-                            next_line = lines[j]
-                            if re.match(r"^[\s\t]+", next_line) and next_line.strip():
-                                task_lines.append(next_line)
-                            elif re.match(r"^- \[", next_line):
-                                break
-                            elif re.match(r"^#", next_line):
-                                break
-                            elif next_line.strip() == "":
-                                task_lines.append(next_line)
-                            else:
-                                break
-                            j += 1
-
-                        modified = True
-                        break
-
-            if modified:
-                file.seek(0)
-                file.truncate()
-                file.writelines(lines)
-
-                # Trim trailing blank lines from output
-                while task_lines and task_lines[-1].strip() == "":
-                    task_lines.pop()
-
-                print("".join(task_lines), end="")
+            task = None
+
+            # mmap refuses empty files, which have no tasks anyway
+            if os.fstat(file.fileno()).st_size:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_WRITE) as mm:
+                    for match in _RE_OPEN_BLOCK.finditer(mm):
+                        line_task_text = normalize(match.group(1))
+                        if line_task_text == normalized_target:
+                            # Found the task - overwrite the state
+                            # character inside the brackets in place
+                            start = match.start()
+                            mm[start + 3:start + 4] = state
+                            task = mm[start:match.end()]
+                            break
+
+            if task is not None:
+                sys.stdout.buffer.write(task)
             else:
                 print(
                     f"Warning: Could not find task matching: {task_text}",
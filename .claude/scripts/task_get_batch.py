@@ -18,7 +18,17 @@ Example output:
 import sys
 import os
 import re
+import mmap
 import fcntl
+from itertools import islice
+
+
+# An incomplete task line plus its continuation: indented lines, possibly
+# separated by blank lines. Trailing blank lines are not part of the block.
+_RE_INCOMPLETE_BLOCK = re.compile(
+    rb"^- \[ \][^\n]*(?:(?:\n[^\S\n]*)*\n[^\S\n]+\S[^\n]*)*\n?",
+    re.MULTILINE,
+)
 
 
 def extract_batch(filename, count):
@@ -28,69 +38,40 @@ def extract_batch(filename, count):
             sys.exit(1)
 
         # Use file locking to prevent race conditions
-        with open(filename, "r+") as file:
+        with open(filename, "rb+") as file:
             fcntl.flock(file.fileno(), fcntl.LOCK_EX)
 
-            lines = file.readlines()
-            tasks = []
-            task_start_indices = []
-
-            # Find all incomplete tasks
-            i = 0
-            while i < len(lines) and len(tasks) < count:
-                if re.match(r"^- \[ \]", lines[i]):
-                    task_lines = [i]  # Store line indices
-                    j = i + 1
-                    while j < len(lines):
-                        next_line = lines[j]
-                        if re.match(r"^[\s\t]+", next_line) and next_line.strip():
-                            task_lines.append(j)
-                        elif re.match(r"^- \[[x>!]\]", next_line):
-                            break
-                        elif re.match(r"^- \[ \]", next_line):
-                            break
-                        elif re.match(r"^#", next_line):
-                            break
-                        elif next_line.strip() == "":
-                            task_lines.append(j)
-                        else:
-                            break
-                        j += 1
-
-                    # Trim trailing blank lines from task
-                    while task_lines and lines[task_lines[-1]].strip() == "":
-                        task_lines.pop()
-
-                    tasks.append(task_lines)
-                    task_start_indices.append(i)
-                    i = j
-                else:
-                    i += 1
-
-            if not tasks:
+            # The parseable output is built straight into one buffer while
+            # the tasks are found, then written with a single call
+            output = bytearray()
+            task_count = 0
+
+            # mmap refuses empty files, which have no tasks anyway
+            if os.fstat(file.fileno()).st_size:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_WRITE) as mm:
+                    # Find up to count incomplete tasks; one regex sweep
+                    # yields each task together with its continuation lines
+                    blocks = islice(_RE_INCOMPLETE_BLOCK.finditer(mm), count)
+                    for task_count, match in enumerate(blocks, 1):
+                        # Mark as in-progress by overwriting the state
+                        # character inside "- [ ]" in place
+                        start = match.start()
+                        mm[start + 3:start + 4] = b">"
+                        output += b"=== TASK %d ===\n" % task_count
+                        output += mm[start:match.end()]
+                        output += b"\n"
+                    # The scanner holds the mapping open; drop it before close
+                    del blocks
+
+            if not task_count:
                 print("No incomplete tasks found", file=sys.stderr)
                 sys.exit(1)
 
-            # Mark all found tasks as in-progress
-            for task_line_indices in tasks:
-                first_idx = task_line_indices[0]
-                lines[first_idx] = re.sub(r"^- \[ \]", "- [>]", lines[first_idx])
-
-            # Write back
-            file.seek(0)
-            file.truncate()
-            file.writelines(lines)
-
             fcntl.flock(file.fileno(), fcntl.LOCK_UN)
 
-        # Output the tasks in a parseable format
-        for task_num, task_line_indices in enumerate(tasks, 1):
-            print(f"=== TASK {task_num} ===")
-            for idx in task_line_indices:
-                print(lines[idx], end="")
-            print()
+        sys.stdout.buffer.write(output)
 
-        print(f"Total: {len(tasks)} tasks extracted", file=sys.stderr)
+        print(f"Total: {task_count} tasks extracted", file=sys.stderr)
 
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -4,125 +4,173 @@ Parse GUT test results and generate validation report
 Usage: python3 parse_test_results.py test_results/*.log > VALIDATION_REPORT.md
 """
 
+import os
 import sys
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from typing import List, NamedTuple
+
+
+_TEST_FILE_MARKER = 'Running tests in:'
+# Matched right after _TEST_FILE_MARKER; only validates the path
+_TEST_PATH_RE = re.compile(r'\s*(res://tests/[\w/]+\.gd)')
+# Summary counts; not anchored, since GUT may indent or colour these lines
+_COUNTS_RE = re.compile(r'(Total|Passed|Failed):\s*(\d+)')
+_ERROR_MARKER = 'SCRIPT ERROR:'
+# Errors are reported on one line, truncated to this many characters
+_ERROR_PREVIEW_CHARS = 200
+
+
+class LogResult(NamedTuple):
+    """Results parsed from a single test log file."""
+    category: str
+    total: int
+    passed: int
+    failed: int
+    errors: List[str]
+    test_files: List[str]
+    compilation_errors: List[str]
 
 
 def parse_log_file(log_path):
     """Parse a single test log file and extract results."""
+    counts = {}
+    test_files = []
+    error_blocks = []
+    in_error = False
+
+    # Stream the log; each SCRIPT ERROR block keeps only its first
+    # _ERROR_PREVIEW_CHARS characters
     with open(log_path, 'r') as f:
-        content = f.read()
-
-    results = {
-        'category': log_path.stem.replace('_results', ''),
-        'total': 0,
-        'passed': 0,
-        'failed': 0,
-        'errors': [],
-        'test_files': [],
-        'compilation_errors': []
-    }
-
-    # Extract test counts
-    total_match = re.search(r'Total:\s*(\d+)', content)
-    passed_match = re.search(r'Passed:\s*(\d+)', content)
-    failed_match = re.search(r'Failed:\s*(\d+)', content)
-
-    if total_match:
-        results['total'] = int(total_match.group(1))
-    if passed_match:
-        results['passed'] = int(passed_match.group(1))
-    if failed_match:
-        results['failed'] = int(failed_match.group(1))
-
-    # Extract test file names
-    test_file_pattern = r'Running tests in:\s*(res://tests/[\w/]+\.gd)'
-    results['test_files'] = re.findall(test_file_pattern, content)
+        for line in f:
+            # A SCRIPT ERROR block runs until the next error or the next
+            # "Running tests" line
+            if line.startswith((_ERROR_MARKER, 'Running tests')) or (
+                    not in_error and _ERROR_MARKER in line):
+                marker = line.find(_ERROR_MARKER)
+                in_error = marker != -1
+                if in_error:
+                    error_blocks.append(line[marker + len(_ERROR_MARKER):].lstrip())
+            elif in_error and len(error_blocks[-1].rstrip()) < _ERROR_PREVIEW_CHARS:
+                error_blocks[-1] = (error_blocks[-1] + line).lstrip()
+
+            # Extract test counts; the first occurrence of each wins
+            for match in _COUNTS_RE.finditer(line):
+                counts.setdefault(match.group(1).lower(), int(match.group(2)))
+
+            # Extract test file names; the literal check skips the regex on
+            # the many lines that cannot contain one
+            start = line.find(_TEST_FILE_MARKER)
+            if start != -1:
+                match = _TEST_PATH_RE.match(line, start + len(_TEST_FILE_MARKER))
+                if match:
+                    test_files.append(match.group(1))
 
     # Extract compilation errors
-    error_pattern = r'SCRIPT ERROR:\s*(.+?)(?=\n(?:SCRIPT ERROR:|Running tests|$))'
-    results['compilation_errors'] = re.findall(error_pattern, content, re.DOTALL)
-
-    return results
+    errors = (
+        block.strip().replace('\n', ' ')[:_ERROR_PREVIEW_CHARS]
+        for block in error_blocks
+    )
+
+    return LogResult(
+        category=log_path.stem.replace('_results', ''),
+        total=counts.get('total', 0),
+        passed=counts.get('passed', 0),
+        failed=counts.get('failed', 0),
+        errors=[],
+        test_files=test_files,
+        compilation_errors=[error for error in errors if error],
+    )
 
 
 def generate_report(all_results):
     """Generate markdown validation report from parsed results."""
-    print("# Test Validation Report")
-    print(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print()
-
-    # Overall summary
-    total_tests = sum(r['total'] for r in all_results)
-    total_passed = sum(r['passed'] for r in all_results)
-    total_failed = sum(r['failed'] for r in all_results)
-
-    print("## Overall Summary")
-    print()
-    print(f"- **Total Tests**: {total_tests}")
-    print(f"- **Passed**: {total_passed} ({total_passed/total_tests*100:.1f}%)" if total_tests > 0 else "- **Passed**: 0")
-    print(f"- **Failed**: {total_failed} ({total_failed/total_tests*100:.1f}%)" if total_tests > 0 else "- **Failed**: 0")
-    print()
+    # Collect the report and write it once at the end
+    out = [
+        "# Test Validation Report",
+        f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        "",
+    ]
+
+    # Overall summary, totalled in a single pass
+    total_tests = total_passed = total_failed = 0
+    for r in all_results:
+        total_tests += r.total
+        total_passed += r.passed
+        total_failed += r.failed
+
+    out.append("## Overall Summary")
+    out.append("")
+    out.append(f"- **Total Tests**: {total_tests}")
+    out.append(f"- **Passed**: {total_passed} ({total_passed/total_tests*100:.1f}%)" if total_tests > 0 else "- **Passed**: 0")
+    out.append(f"- **Failed**: {total_failed} ({total_failed/total_tests*100:.1f}%)" if total_tests > 0 else "- **Failed**: 0")
+    out.append("")
 
     # Category breakdown
-    print("## Results by Category")
-    print()
+    out.append("## Results by Category")
+    out.append("")
 
     for result in all_results:
-        category = result['category'].replace('_', ' ').title()
-        status_emoji = "✅" if result['failed'] == 0 and result['total'] > 0 else "❌"
-
-        print(f"### {status_emoji} {category}")
-        print()
-        print(f"- **Total**: {result['total']}")
-        print(f"- **Passed**: {result['passed']}")
-        print(f"- **Failed**: {result['failed']}")
-        print()
-
-        if result['test_files']:
-            print(f"**Test Files** ({len(result['test_files'])}):")
-            for test_file in result['test_files']:
-                print(f"- `{test_file}`")
-            print()
-
-        if result['compilation_errors']:
-            print("**Compilation Errors:**")
-            for i, error in enumerate(result['compilation_errors'][:5], 1):  # Limit to 5
-                error_clean = error.strip().replace('\n', ' ')[:200]  # Truncate long errors
-                print(f"{i}. {error_clean}...")
-            if len(result['compilation_errors']) > 5:
-                print(f"... and {len(result['compilation_errors']) - 5} more errors")
-            print()
+        total, passed, failed = result.total, result.passed, result.failed
+        test_files = result.test_files
+        compilation_errors = result.compilation_errors
+        category = result.category.replace('_', ' ').title()
+        status_emoji = "✅" if failed == 0 and total > 0 else "❌"
+
+        out.extend([
+            f"### {status_emoji} {category}",
+            "",
+            f"- **Total**: {total}",
+            f"- **Passed**: {passed}",
+            f"- **Failed**: {failed}",
+            "",
+        ])
+
+        if test_files:
+            out.append(f"**Test Files** ({len(test_files)}):")
+            for test_file in test_files:
+                out.append(f"- `{test_file}`")
+            out.append("")
+
+        if compilation_errors:
+            out.append("**Compilation Errors:**")
+            for i, error in enumerate(compilation_errors[:5], 1):  # Limit to 5
+                out.append(f"{i}. {error}...")
+            if len(compilation_errors) > 5:
+                out.append(f"... and {len(compilation_errors) - 5} more errors")
+            out.append("")
 
     # Recommendations
-    print("## Recommendations")
-    print()
+    out.append("## Recommendations")
+    out.append("")
 
     if total_failed > 0:
-        print("### Critical Issues")
-        print()
+        out.append("### Critical Issues")
+        out.append("")
         for result in all_results:
-            if result['failed'] > 0:
-                print(f"- Fix {result['failed']} failing tests in **{result['category']}**")
-        print()
-
-    if any(r['compilation_errors'] for r in all_results):
-        print("### Compilation Errors")
-        print()
-        print("The following categories have compilation errors that prevent tests from running:")
+            if result.failed > 0:
+                out.append(f"- Fix {result.failed} failing tests in **{result.category}**")
+        out.append("")
+
+    if any(r.compilation_errors for r in all_results):
+        out.append("### Compilation Errors")
+        out.append("")
+        out.append("The following categories have compilation errors that prevent tests from running:")
         for result in all_results:
-            if result['compilation_errors']:
-                print(f"- **{result['category']}**: {len(result['compilation_errors'])} errors")
-        print()
+            if result.compilation_errors:
+                out.append(f"- **{result.category}**: {len(result.compilation_errors)} errors")
+        out.append("")
 
-    print("### Next Steps")
-    print()
-    print("1. Fix all compilation errors")
-    print("2. Investigate and fix failing tests")
-    print("3. Run validation again to verify fixes")
-    print("4. Update test coverage for missing areas")
+    out.append("### Next Steps")
+    out.append("")
+    out.append("1. Fix all compilation errors")
+    out.append("2. Investigate and fix failing tests")
+    out.append("3. Run validation again to verify fixes")
+    out.append("4. Update test coverage for missing areas")
+
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def main():
@@ -130,19 +178,27 @@ def main():
         print("Usage: python3 parse_test_results.py <log_file1> [log_file2] ...", file=sys.stderr)
         sys.exit(1)
 
-    all_results = []
+    log_paths = []
     for log_path_str in sys.argv[1:]:
         log_path = Path(log_path_str)
         if log_path.exists():
-            results = parse_log_file(log_path)
-            all_results.append(results)
+            log_paths.append(log_path)
         else:
             print(f"Warning: {log_path} not found", file=sys.stderr)
 
-    if not all_results:
+    if not log_paths:
         print("Error: No valid log files found", file=sys.stderr)
         sys.exit(1)
 
+    # Logs are independent, so parse them in parallel (map keeps the order).
+    # A single log is parsed in-process to avoid the worker start-up cost.
+    if len(log_paths) > 1:
+        workers = min(len(log_paths), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            all_results = list(executor.map(parse_log_file, log_paths))
+    else:
+        all_results = [parse_log_file(log_paths[0])]
+
     generate_report(all_results)
 
 